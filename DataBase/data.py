@@ -1,262 +1,348 @@
-import mmap
-
-class Pointer:
-    """ A Pointer consists of 32 bits.
-    The first bit is reserved.
-    The next 23 bits represent the Page Number.
-    The remaining 8 bits represent the Line Number.
-    """
-    def __init__(self, page: int = 0, line: int = 0) -> None:
-        if page > 8388607 or page < 0:
-            raise ValueError('Page number must be positive and less than 8388607')
-        if line > 255 or line < 0:
-            raise ValueError('Line number must be positive and less than 255')
-        self._pointer: bytes = page.to_bytes(length=3) + line.to_bytes(length=1)
-
-    @staticmethod
-    def from_bytes(chars: bytes) -> 'Pointer':
-        """
-        Alternative constructor for Pointer.
-        :param chars: 4 bytes representing a Pointer.
-        :return: Pointer object.
-        :raises ValueError: If the input is not 4 bytes long.
-        """
-        if len(chars) != 4:
-            raise ValueError('Pointer must be 4 bytes long')
-        new_pointer = Pointer() # blank pointer
-        new_pointer._pointer = chars # inject the bytes into the blank pointer
-        return new_pointer
-
-    @property
-    def page(self) -> int:
-        return int.from_bytes(self._pointer[:3])
-
-    @property
-    def line(self) -> int:
-        return self._pointer[-1]
-
-    def __str__(self) -> str:
-        return f"{self.page}:{self.line}"
-
-    def __repr__(self) -> str:
-        return f'pointer({self.page}, {self.line})'
-
-    def __eq__(self, other: 'Pointer') -> bool:
-        return self._pointer == other._pointer
-
-
-PAGE_SIZE = 4096
-
-class Record():
-    """
-    A Record consists of a Record Type and its Data.
-    The first 2 bytes represent the Record Type.
-    The remaining bytes represent the Data.
-    """
-    def __init__(self, record: bytes) -> None:
-        self._record = record
-
-    @property
-    def record_type(self) -> int:
-        return int.from_bytes(self._record[:2])
-
-    @property
-    def data(self) -> bytes:
-        return self._record[2:]
-
-    def __eq__(self, other: 'Record') -> bool:
-        return self._record == other._record
-
-    def __ne__(self, other: 'Record') -> bool:
-        return self._record != other._record
-
-    def __lt__(self, other: 'Record') -> bool:
-        return self._record < other._record
-
-    def __le__(self, other: 'Record') -> bool:
-        return self._record <= other._record
-
-    def __gt__(self, other: 'Record') -> bool:
-        return self._record > other._record
-
-    def __ge__(self, other: 'Record') -> bool:
-        return self._record >= other._record
-
-    def __len__(self) -> int:
-        return len(self._record)
-
-    def __getitem__(self, key: int) -> int:
-        return self._record[key]
-
-    def __setitem__(self, key: int, value: int) -> None:
-        self._record[key] = value
-
-    def __delitem__(self, key: int) -> None:
-        del self._record[key]
-
-    def __iter__(self) -> Iterator[int]:
-        return iter(self._record)
-
-    def __contains__(self, item: int) -> bool:
-        return item in self._record
-
-    def __reversed__(self) -> Iterator[int]:
-        return reversed(self._record)
-
-    def __add__(self, other: 'Record') -> 'Record':
-        return Record(self._record + other._record)
-
-    def __radd__(self, other: 'Record') -> 'Record':
-        return Record(other._record + self._record)
-
-    def __iadd__(self, other: 'Record') -> '
-
-class DB_Page():
-    """
-    A DB_Page consists of PAGE_SIZE bytes.
-    It contains a memory mapped page of the database.
-
-    The first 24 bytes represent the Page Header.
-    The last 8 bytes represent the Page Trailer.
-    The Line Index comes just before the Page Trailer,
-    and consists Line Index Entries for each Record on the Page.
-    The Records come just after the Page Header, and are kept contiguous.
-    The rest of the Page is known as the Free Space.
-    """
-
-    class PageHeader:
-        """
-        The Page Header consists of 24 bytes.
-        The first 4 bytes contain the Page Number.
-        The next 4 bytes represent the Calc First Pointer.
-        The next 4 bytes represent the Calc Last Pointer.
-        The next 2 bytes record the available Free Space.
-        The next 2 bytes is a Write Switch for use by the DBMS.
-        The remaining 8 bytes are reserved.
-        """
-
-        def __init__(self, header: bytes) -> None:
-            self._header = header
-
-        @property
-        def page_number(self) -> int:
-            return int.from_bytes(self._header[:4])
-
-        @property
-        def calc_first(self) -> Pointer:
-            return Pointer.from_bytes(self._header[4:8])
-
-        @property
-        def calc_last(self) -> Pointer:
-            return Pointer.from_bytes(self._header[8:12])
-
-        @property
-        def available_space(self) -> int:
-            return int.from_bytes(self._header[12:14])
-
-    class PageTrailer():
-        """
-        The Page Trailer consists of 8 bytes.
-        The first byte is the count of Line Index Entries.
-        The last 4 bytes contain the Page Number which should
-        be the same as the Page Number in the Page Header.
-        """
-
-            def __init__(self, trailer: bytes) -> None:
-                self._trailer = trailer
-
-            @property
-            def line_index_count(self) -> int:
-                return self._trailer[0]
-
-            @property
-            def page_number(self) -> int:
-                return int.from_bytes(self._trailer[4:])
-
-    class LineIndex(size: int):
-        """
-        The Line Index consists of size Line Index Entries
-        stored just before the Page Trailer in reverse list order.
-        """
-
-        class LineIndexEntry():
-            """
-            A Line Index Entry consists of 8 bytes used to locate a line on the page
-            containing a Record.
-            The first 2 bytes represent the Record Type indexed.
-            The next 2 bytes represent the offset on the page of the line.
-            The next 2 bytes represent the length of the line.
-            The last 2 bytes represents the size of the pointers at the start of the line.
-            """
-                def __init__(self, entry: bytes) -> None:
-                    self._entry = entry
-
-                @property
-                def record_type(self) -> int:
-                    return int.from_bytes(self._entry[:2])
-
-                @property
-                def offset(self) -> int:
-                    return int.from_bytes(self._entry[2:4])
-
-                @property
-                def length(self) -> int:
-                    return int.from_bytes(self._entry[4:6])
-
-                @property
-                def pointer_size(self) -> int:
-                    return int.from_bytes(self._entry[6:])
-
-        def __init__(self, contents: bytes) -> None:
-            self._entries = [self.LineIndexEntry(contents[-(i+8):-i])
-                              for i in range(len(contents), 0, -8)]
-
-        class Line():
-            """
-            A Line consists of a Record of a given type and its Pointers.
-            The first pointer_count * 4 bytes represent the Pointers.
-            The remaining bytes represent the Record.
-            """
-            def __init__(self, record_type: int, line: bytes, pointer_count: int) -> None:
-                self._record_type = record_type
-                self._line = line
-                self._pointer_count = pointer_count
-
-            @property
-            def pointers(self) -> List[Pointer]:
-                return [Pointer.from_bytes(self._line[4*i:4*(i+1)])
-                        for i in range(self._pointer_count)]
-
-            @property
-            def record(self) -> Record:
-                return Record(self._record_type, self._line[4*self._pointer_count:])
-
-
-    def __init__(self, page: mmap.mmap) -> None:
-        self._page = page
-        self._page_header = self.PageHeader(self._page[:24])
-        self._page_trailer = self.PageTrailer(self._page[-8:])
-        assert self._page_header.page_number == self._page_trailer.page_number
-        entry_count = self._page_trailer.line_index_count
-        self._line_index = self.LineIndex(self.page[-8 * (entry_count + 1): -8])
-        self._records = [self.Line(entry.record_type, self._page[entry.offset:entry.offset + entry.length],
-                               entry.pointer_size)
-                         for entry in self._line_index]
-
-    def __getitem__(self, key: int) -> Record:
-        return self._records[key]
-
-    def __setitem__(self, key: int, value: Record) -> None:
-        self._records[key] = value
-
-    def __delitem__(self, key: int) -> None:
-        del self._records[key]
-
-    def __iter__(self) -> Iterator[Record]:
-        return iter(self._records)
-
-    def __len__(self) -> int:
-        return len(self._records)
-
-    def __contains__(self, item: Record) -> bool:
-        return item in self._records
+import mmap
+import struct
+import weakref
+from typing import Iterator
+
+import numpy as np
+
+try:
+    import scan
+except ImportError:  # Numba not installed; scans fall back to plain NumPy
+    scan = None
+
+try:
+    import data_fast
+except ImportError:  # compiled extension not built; see data_fast.pyx
+    data_fast = None
+
+
+# A packed Pointer is one big-endian uint32; a shared Struct packs and
+# unpacks it in a single call.
+_PTR_STRUCT = struct.Struct('>I')
+
+# Bound unpackers for the big-endian integers embedded in pages. One C
+# call reading straight from a buffer, with no slice or argument parsing.
+_u16 = struct.Struct('>H').unpack_from
+_u32 = struct.Struct('>I').unpack_from
+
+# Flyweight cache of live Pointers keyed by their packed value. Hot
+# pointer values (index roots, calc-chain heads) recur constantly during
+# traversals; sharing one instance per value avoids re-allocating them.
+_PTR_CACHE: 'weakref.WeakValueDictionary[int, Pointer]' = weakref.WeakValueDictionary()
+
+# Page Header: Page Number, Calc First, Calc Last, Available Space,
+# Write Switch, 8 reserved bytes.
+_HDR_STRUCT = struct.Struct('>IIIHH8x')
+# Page Trailer: Line Index Entry count, 3 reserved bytes, Page Number.
+_TRL_STRUCT = struct.Struct('>B3xI')
+
+class Pointer:
+    """ A Pointer consists of 32 bits.
+    The first bit is reserved.
+    The next 23 bits represent the Page Number.
+    The remaining 8 bits represent the Line Number.
+    """
+    __slots__ = ('_value', '__weakref__')
+
+    def __new__(cls, page: int = 0, line: int = 0,
+                _cache_get=_PTR_CACHE.get) -> 'Pointer':
+        value = (page << 8) | line
+        cached = _cache_get(value)
+        if cached is not None:
+            return cached
+        new_pointer = super().__new__(cls)
+        if not ((page & ~0x7FFFFF) | (line & ~0xFF)):
+            _PTR_CACHE[value] = new_pointer
+        return new_pointer
+
+    def __init__(self, page: int = 0, line: int = 0) -> None:
+        # Any out-of-range or negative value leaves bits outside the
+        # 23-bit page / 8-bit line masks, so one test covers all four checks.
+        if (page & ~0x7FFFFF) | (line & ~0xFF):
+            raise ValueError('Page number must be 0 to 8388607 '
+                             'and line number 0 to 255')
+        self._value: int = (page << 8) | line
+
+    @staticmethod
+    def from_bytes(chars: bytes, _unpack=_PTR_STRUCT.unpack,
+                   _cache_get=_PTR_CACHE.get) -> 'Pointer':
+        """
+        Alternative constructor for Pointer.
+        :param chars: 4 bytes representing a Pointer.
+        :return: Pointer object.
+        :raises ValueError: If the input is not 4 bytes long.
+        """
+        if len(chars) != 4:
+            raise ValueError('Pointer must be 4 bytes long')
+        value = _unpack(chars)[0]
+        cached = _cache_get(value)
+        if cached is not None:
+            return cached
+        # Four bytes can only hold an in-range value, so skip __new__'s
+        # second cache probe and __init__'s validation entirely.
+        new_pointer = object.__new__(Pointer)
+        new_pointer._value = value
+        _PTR_CACHE[value] = new_pointer
+        return new_pointer
+
+    def __bytes__(self, _pack=_PTR_STRUCT.pack) -> bytes:
+        return _pack(self._value)
+
+    @property
+    def page(self) -> int:
+        return self._value >> 8
+
+    @property
+    def line(self) -> int:
+        return self._value & 0xFF
+
+    def __str__(self) -> str:
+        return f"{self.page}:{self.line}"
+
+    def __repr__(self) -> str:
+        return f'pointer({self.page}, {self.line})'
+
+    def __eq__(self, other: 'Pointer') -> bool:
+        return self._value == other._value
+
+
+# The null pointer is the most common value of all, so keep the shared
+# instance permanently alive rather than letting the weak cache drop it.
+_NULL_POINTER = Pointer()
+
+
+def ptr_page(value: int) -> int:
+    """The Page Number held in a packed uint32 Pointer value."""
+    return value >> 8
+
+def ptr_line(value: int) -> int:
+    """The Line Number held in a packed uint32 Pointer value."""
+    return value & 0xFF
+
+
+class PointerView:
+    """
+    A sequence of Pointers kept as their packed uint32 values.
+    Hot paths read the raw array through .values (with ptr_page and
+    ptr_line, or scan.decode_pointers); indexing and iteration
+    materialise shared Pointer objects only on demand.
+    """
+    __slots__ = ('_values',)
+
+    def __init__(self, values: np.ndarray) -> None:
+        self._values = values
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    def __len__(self) -> int:
+        return self._values.size
+
+    def __getitem__(self, key: int) -> Pointer:
+        value = int(self._values[key])
+        return Pointer(value >> 8, value & 0xFF)
+
+    def __iter__(self) -> Iterator[Pointer]:
+        return (self[i] for i in range(self._values.size))
+
+    def __eq__(self, other) -> bool:
+        return (len(self) == len(other)
+                and all(mine == theirs for mine, theirs in zip(self, other)))
+
+
+PAGE_SIZE = 4096
+
+class Record(bytes):
+    """
+    A Record consists of a Record Type and its Data.
+    The first 2 bytes represent the Record Type.
+    The remaining bytes represent the Data.
+
+    Record is an immutable bytes subclass, so comparison, hashing,
+    length, indexing, iteration and containment all run in C with no
+    Python-level dispatch.
+    """
+    __slots__ = ()
+
+    @property
+    def record_type(self, _u16=_u16) -> int:
+        return _u16(self, 0)[0]
+
+    @property
+    def data(self) -> bytes:
+        return self[2:]
+
+    @property
+    def view(self) -> memoryview:
+        """Zero-copy read access to the underlying bytes."""
+        return memoryview(self)
+
+    def __add__(self, other: 'Record') -> 'Record':
+        return Record(bytes.__add__(self, other))
+
+    def __radd__(self, other: 'Record') -> 'Record':
+        return Record(bytes.__add__(other, self))
+
+
+class DB_Page():
+    """
+    A DB_Page consists of PAGE_SIZE bytes.
+    It contains a memory mapped page of the database.
+
+    The first 24 bytes represent the Page Header:
+    the Page Number (4 bytes), the Calc First and Calc Last Pointers
+    (4 bytes each), the available Free Space (2 bytes), a Write Switch
+    for use by the DBMS (2 bytes) and 8 reserved bytes.
+    The last 8 bytes represent the Page Trailer:
+    the count of Line Index Entries (1 byte), 3 reserved bytes, and the
+    Page Number again as a cross-check on the Header.
+    The Line Index comes just before the Page Trailer,
+    and consists Line Index Entries for each Record on the Page.
+    The Records come just after the Page Header, and are kept contiguous.
+    The rest of the Page is known as the Free Space.
+    """
+
+    class Line():
+        """
+        A Line consists of a Record of a given type and its Pointers.
+        The first pointer_count * 4 bytes represent the Pointers.
+        The remaining bytes represent the Record.
+        """
+        __slots__ = ('_record_type', '_line', '_pointer_count')
+
+        def __init__(self, record_type: int, line: bytes, pointer_count: int) -> None:
+            self._record_type = record_type
+            self._line = line
+            self._pointer_count = pointer_count
+
+        @property
+        def pointer_values(self) -> np.ndarray:
+            """The line's Pointers as packed big-endian uint32 values."""
+            return np.frombuffer(self._line, dtype='>u4',
+                                 count=self._pointer_count)
+
+        @property
+        def pointers(self) -> PointerView:
+            return PointerView(self.pointer_values)
+
+        @property
+        def record(self) -> Record:
+            return Record(self._line[4*self._pointer_count:])
+
+
+    __slots__ = ('_page', '_mv', '_record_types', '_offsets', '_lengths',
+                 '_pointer_sizes', '_line_cache', 'page_number',
+                 'available_space', 'write_switch', '_calc_first', '_calc_last')
+
+    def __init__(self, page: mmap.mmap) -> None:
+        self._page = page
+        # Slicing the mmap copies bytes out of the mapping; slicing a
+        # memoryview of it is free, so all parsing reads through this view.
+        self._mv = memoryview(page)
+        (self.page_number, self._calc_first, self._calc_last,
+         self.available_space, self.write_switch) = _HDR_STRUCT.unpack_from(self._mv, 0)
+        entry_count, trailer_page_number = _TRL_STRUCT.unpack_from(self._mv, PAGE_SIZE - 8)
+        assert self.page_number == trailer_page_number
+        # The Line Index is stored in reverse list order just before the
+        # Page Trailer. Each 8-byte entry is read as one big-endian uint64
+        # and all four fields are peeled off with vectorised shifts and
+        # masks - four C loops instead of four int parses per entry.
+        raw = np.frombuffer(self._mv, dtype='>u8', count=entry_count,
+                            offset=PAGE_SIZE - 8 - 8 * entry_count)[::-1]
+        self._record_types = (raw >> 48).astype(np.uint16)
+        self._offsets = ((raw >> 32) & 0xFFFF).astype(np.uint16)
+        self._lengths = ((raw >> 16) & 0xFFFF).astype(np.uint16)
+        self._pointer_sizes = (raw & 0xFFFF).astype(np.uint16)
+        self._line_cache: dict = {}
+
+    @property
+    def calc_first(self) -> Pointer:
+        return Pointer(self._calc_first >> 8, self._calc_first & 0xFF)
+
+    @property
+    def calc_last(self) -> Pointer:
+        return Pointer(self._calc_last >> 8, self._calc_last & 0xFF)
+
+    def find_record_type(self, record_type: int) -> int:
+        """
+        Find the first Line on the page holding a Record of the given type.
+        :param record_type: the Record Type searched for.
+        :return: line index of the first match, or -1 if not present.
+        """
+        if data_fast is not None:
+            return data_fast.find_record_type(data_fast.CPage(self._mv),
+                                              record_type)
+        if scan is not None:
+            return int(scan.find_by_type(self._record_types, record_type))
+        matches = np.flatnonzero(self._record_types == record_type)
+        return int(matches[0]) if matches.size else -1
+
+    def __getitem__(self, key: int) -> 'DB_Page.Line':
+        line = self._line_cache.get(key)
+        if line is None:
+            offset = self._offsets[key]
+            line = self.Line(int(self._record_types[key]),
+                             self._mv[offset:offset + self._lengths[key]],
+                             int(self._pointer_sizes[key]))
+            self._line_cache[key] = line
+        return line
+
+    def __iter__(self) -> Iterator['DB_Page.Line']:
+        return (self[i] for i in range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self._record_types)
+
+    def __contains__(self, item: Record) -> bool:
+        return any(line.record == item for line in self)
+
+
+class DB_File():
+    """
+    A DB_File is the whole database file memory mapped once and viewed
+    as an array of PAGE_SIZE byte pages. Indexing yields a DB_Page over
+    a zero-copy view of the wanted page, so opening many pages costs one
+    kernel mapping rather than one mmap object per page.
+    """
+
+    __slots__ = ('_arr',)
+
+    def __init__(self, path: str) -> None:
+        self._arr = np.memmap(path, dtype=np.uint8,
+                              mode='r+').reshape(-1, PAGE_SIZE)
+
+    def __getitem__(self, page_number: int) -> DB_Page:
+        return DB_Page(self._arr[page_number])
+
+    def __len__(self) -> int:
+        return self._arr.shape[0]
+
+    def __iter__(self) -> Iterator[DB_Page]:
+        return (self[i] for i in range(len(self)))
+
+    def scan_type(self, record_type: int,
+                  page_range: slice = slice(None)) -> np.ndarray:
+        """
+        Find every page in page_range holding a Record of the given type.
+        One vectorised pass batches the Line Index tails of all candidate
+        pages instead of opening and parsing pages one by one.
+        :param record_type: the Record Type searched for.
+        :param page_range: slice of page numbers to scan (default: all).
+        :return: array of matching page numbers in file order.
+        """
+        pages = self._arr[page_range]
+        counts = pages[:, PAGE_SIZE - 8].astype(np.intp)
+        max_count = int(counts.max(initial=0))
+        start, _, step = page_range.indices(len(self))
+        if max_count == 0:
+            return np.empty(0, dtype=np.intp)
+        # Pull the widest needed Line Index tail from every page at once,
+        # then read the entries as uint64 and peel off the Record Types.
+        tails = np.ascontiguousarray(
+            pages[:, PAGE_SIZE - 8 - 8 * max_count:PAGE_SIZE - 8])
+        raw = tails.view('>u8')[:, ::-1]
+        record_types = (raw >> 48).astype(np.uint16)
+        valid = np.arange(max_count) < counts[:, None]
+        hits = ((record_types == record_type) & valid).any(axis=1)
+        return start + np.flatnonzero(hits) * step
@@ -0,0 +1,58 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+C-speed scanning over raw pages, for callers that build the extension:
+
+    cythonize -3 --inplace data_fast.pyx
+
+data.py picks these up automatically when the compiled module imports,
+and falls back to its NumPy/Numba paths otherwise. Everything here
+indexes the page bytes directly, so a scan allocates no Python objects
+at all until it yields a result.
+"""
+
+cdef Py_ssize_t PAGE_SIZE = 4096
+
+cdef inline int _u16_be(const unsigned char* p) noexcept nogil:
+    return (p[0] << 8) | p[1]
+
+
+cdef class CPage:
+    """A borrowed view of one PAGE_SIZE byte page."""
+    cdef const unsigned char[::1] buf
+
+    def __cinit__(self, const unsigned char[::1] buf):
+        if buf.shape[0] != PAGE_SIZE:
+            raise ValueError('Page must be PAGE_SIZE bytes long')
+        self.buf = buf
+
+
+def find_record_type(CPage page, int needle):
+    """
+    Find the first line holding a Record of the wanted type.
+    :param page: the page to scan.
+    :param needle: the Record Type searched for.
+    :return: line index of the first match, or -1 if not present.
+    """
+    cdef const unsigned char* base = &page.buf[0]
+    cdef int count = base[PAGE_SIZE - 8]
+    cdef int i
+    for i in range(count):
+        # Line Index Entries sit just before the trailer in reverse order.
+        if _u16_be(base + PAGE_SIZE - 16 - 8 * i) == needle:
+            return i
+    return -1
+
+
+def iter_records(CPage page):
+    """
+    Yield (record_type, offset, length, pointer_size) for each line.
+    :param page: the page to walk.
+    """
+    cdef const unsigned char* base = &page.buf[0]
+    cdef int count = base[PAGE_SIZE - 8]
+    cdef const unsigned char* entry
+    cdef int i
+    for i in range(count):
+        entry = base + PAGE_SIZE - 16 - 8 * i
+        yield (_u16_be(entry), _u16_be(entry + 2),
+               _u16_be(entry + 4), _u16_be(entry + 6))
@@ -0,0 +1,39 @@
+"""
+JIT-compiled helpers for the hot scan loops.
+
+These work on the plain NumPy arrays that data.py exposes (Record Types
+from the Line Index, packed uint32 Pointers from a Line), so the tight
+per-entry loops run as machine code instead of interpreter bytecode.
+Numba needs native byte order, so callers convert the big-endian page
+views with .astype() first.
+"""
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def find_by_type(record_types: np.ndarray, needle: int) -> int:
+    """
+    Find the first line holding a Record of the wanted type.
+    :param record_types: uint16 array of Record Types in line order.
+    :param needle: the Record Type searched for.
+    :return: index of the first match, or -1 if the type is not present.
+    """
+    for i in range(record_types.size):
+        if record_types[i] == needle:
+            return i
+    return -1
+
+@njit(cache=True)
+def decode_pointers(values: np.ndarray) -> tuple:
+    """
+    Split packed uint32 Pointers into their Page and Line Numbers.
+    :param values: uint32 array of packed Pointers.
+    :return: (page numbers as uint32, line numbers as uint8).
+    """
+    pages = np.empty(values.size, dtype=np.uint32)
+    lines = np.empty(values.size, dtype=np.uint8)
+    for i in range(values.size):
+        pages[i] = values[i] >> 8
+        lines[i] = values[i] & 0xFF
+    return pages, lines
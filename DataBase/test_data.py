@@ -1,5 +1,8 @@
+import mmap
+import os
+import tempfile
 import unittest
-from data import Pointer
+from data import PAGE_SIZE, DB_File, DB_Page, Pointer, Record
 
 class TestPointer(unittest.TestCase):
     def setUp(self):
@@ -21,11 +24,144 @@ class TestPointer(unittest.TestCase):
         other = Pointer(1812, 3)
         self.assertTrue(self.test_pointer == other)
 
+    def test_interning(self):
+        self.assertIs(self.test_pointer, Pointer(1812, 3))
+        byte_repr = (1812).to_bytes(length=3) + (3).to_bytes(length=1)
+        self.assertIs(self.test_pointer, Pointer.from_bytes(byte_repr))
+
+    def test_bytes(self):
+        byte_repr = (1812).to_bytes(length=3) + (3).to_bytes(length=1)
+        self.assertEqual(bytes(self.test_pointer), byte_repr)
+
     def test_from_bytes(self):
         byte_repr = (2023).to_bytes(length=3) + (6).to_bytes(length=1)
         other = Pointer.from_bytes(byte_repr)
         self.assertEqual(other.page, 2023)
         self.assertEqual(other.line, 6)
 
+class TestRecord(unittest.TestCase):
+    def setUp(self):
+        self.test_record = Record((100).to_bytes(length=2) + b'hello')
+
+    def test_record_type(self):
+        self.assertEqual(self.test_record.record_type, 100)
+
+    def test_data(self):
+        self.assertEqual(self.test_record.data, b'hello')
+
+    def test_add(self):
+        other = Record(b' world')
+        self.assertEqual((self.test_record + other).data, b'hello world')
+
+    def test_iadd(self):
+        self.test_record += Record(b'!')
+        self.assertEqual(self.test_record.data, b'hello!')
+
+    def test_comparisons(self):
+        self.assertEqual(self.test_record, Record((100).to_bytes(length=2) + b'hello'))
+        self.assertLess(self.test_record, Record((101).to_bytes(length=2)))
+
+
+def build_test_page(page_number: int = 7) -> bytes:
+    """Assemble a single well-formed page holding two lines.
+
+    Line 0 has one pointer (5:1) and record type 100 with data b'hello'.
+    Line 1 has no pointers and record type 200 with data b'world'.
+    """
+    header = (page_number.to_bytes(length=4)
+              + ((5 << 8) | 1).to_bytes(length=4)    # calc first
+              + ((9 << 8) | 2).to_bytes(length=4)    # calc last
+              + (4000).to_bytes(length=2)            # available space
+              + bytes(2)                             # write switch
+              + bytes(8))                            # reserved
+    line_0 = ((5 << 8) | 1).to_bytes(length=4) + (100).to_bytes(length=2) + b'hello'
+    line_1 = (200).to_bytes(length=2) + b'world'
+    entry_0 = ((100).to_bytes(length=2) + (24).to_bytes(length=2)
+               + len(line_0).to_bytes(length=2) + (1).to_bytes(length=2))
+    entry_1 = ((200).to_bytes(length=2) + (24 + len(line_0)).to_bytes(length=2)
+               + len(line_1).to_bytes(length=2) + (0).to_bytes(length=2))
+    trailer = (2).to_bytes(length=1) + bytes(3) + page_number.to_bytes(length=4)
+    free = PAGE_SIZE - len(header) - len(line_0) - len(line_1) - 16 - len(trailer)
+    # The Line Index is stored in reverse list order just before the trailer.
+    return header + line_0 + line_1 + bytes(free) + entry_1 + entry_0 + trailer
+
+
+class TestDBPage(unittest.TestCase):
+    def setUp(self):
+        self.file = tempfile.NamedTemporaryFile(delete=False)
+        self.file.write(build_test_page())
+        self.file.flush()
+        self.map = mmap.mmap(self.file.fileno(), PAGE_SIZE)
+        self.test_page = DB_Page(self.map)
+
+    def tearDown(self):
+        del self.test_page  # release the page's views of the mmap
+        self.map.close()
+        self.file.close()
+        os.unlink(self.file.name)
+
+    def test_len(self):
+        self.assertEqual(len(self.test_page), 2)
+
+    def test_header_fields(self):
+        self.assertEqual(self.test_page.page_number, 7)
+        self.assertEqual(self.test_page.available_space, 4000)
+        self.assertEqual(self.test_page.calc_first, Pointer(5, 1))
+        self.assertEqual(self.test_page.calc_last, Pointer(9, 2))
+
+    def test_record(self):
+        self.assertEqual(self.test_page[0].record.record_type, 100)
+        self.assertEqual(self.test_page[0].record.data, b'hello')
+        self.assertEqual(self.test_page[1].record.data, b'world')
+
+    def test_find_record_type(self):
+        self.assertEqual(self.test_page.find_record_type(200), 1)
+        self.assertEqual(self.test_page.find_record_type(999), -1)
+
+    def test_pointer_values(self):
+        values = self.test_page[0].pointer_values
+        self.assertEqual(list(values), [(5 << 8) | 1])
+
+    def test_pointers(self):
+        pointers = self.test_page[0].pointers
+        self.assertEqual(len(pointers), 1)
+        self.assertEqual(pointers[0], Pointer(5, 1))
+        self.assertEqual(list(pointers.values), [(5 << 8) | 1])
+        self.assertEqual(self.test_page[1].pointers, [])
+
+
+class TestDBFile(unittest.TestCase):
+    def setUp(self):
+        self.file = tempfile.NamedTemporaryFile(delete=False)
+        for page_number in range(3):
+            self.file.write(build_test_page(page_number))
+        self.file.close()
+        self.db_file = DB_File(self.file.name)
+
+    def tearDown(self):
+        del self.db_file
+        os.unlink(self.file.name)
+
+    def test_len(self):
+        self.assertEqual(len(self.db_file), 3)
+
+    def test_getitem(self):
+        page = self.db_file[2]
+        self.assertEqual(page[0].record.data, b'hello')
+
+    def test_iter(self):
+        self.assertEqual(sum(len(page) for page in self.db_file), 6)
+
+    def test_scan_type(self):
+        self.assertEqual(list(self.db_file.scan_type(200)), [0, 1, 2])
+        self.assertEqual(list(self.db_file.scan_type(200, slice(1, 3))), [1, 2])
+        self.assertEqual(list(self.db_file.scan_type(999)), [])
+
+    def test_scan_type_stepped(self):
+        self.assertEqual(list(self.db_file.scan_type(200, slice(0, 3, 2))), [0, 2])
+        self.assertEqual(list(self.db_file.scan_type(200, slice(None, None, -1))),
+                         [2, 1, 0])
+
+
 if __name__ == '__main__':
     unittest.main()